@@ -0,0 +1,15 @@
+"""
+Quantum Self-Learning Matrix — WSGI Entry Point
+© 2025 swordenkisk (https://github.com/swordenkisk)
+All Rights Reserved.
+
+Production launch:
+
+    gunicorn -w $(nproc) -k gthread --threads 4 --preload wsgi:application
+
+--preload imports the app (engine, precomputed tables, warmed caches)
+once in the master, so workers fork and share it copy-on-write instead
+of each paying startup cost. `python server.py` remains the dev server.
+"""
+
+from server import app as application  # noqa: F401